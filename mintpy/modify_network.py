@@ -7,6 +7,7 @@
 
 
 import os
+import re
 import sys
 import argparse
 import h5py
@@ -17,7 +18,6 @@ from mintpy.objects import ifgramStack
 from mintpy.defaults.template import get_template_content
 from mintpy.utils import (
     ptime,
-    readfile,
     utils as ut,
     network as pnet,
     plot as pp,
@@ -49,7 +49,16 @@ EXAMPLE = """example:
 """
 
 
+# memoized parser object, to avoid rebuilding the full argparse tree
+# when main() is called repeatedly from driver scripts
+_PARSER = None
+
+
 def create_parser():
+    global _PARSER
+    if _PARSER is not None:
+        return _PARSER
+
     parser = argparse.ArgumentParser(description='Modify the network of interferograms',
                                      formatter_class=argparse.RawTextHelpFormatter,
                                      epilog=REFERENCE+'\n'+TEMPLATE+'\n'+EXAMPLE)
@@ -111,6 +120,8 @@ def create_parser():
     manual = parser.add_argument_group('Manual Network', 'Manually select/drop/modify network')
     manual.add_argument('--manual', action='store_true',
                         help='display network to manually choose line/interferogram to remove')
+
+    _PARSER = parser
     return parser
 
 
@@ -142,25 +153,107 @@ def cmd_line_parse(iargs=None):
     return inps
 
 
-def read_input_index_list(idxList, stackFile=None):
-    """Read ['2','3:5','10'] into ['2','3','4','5','10']"""
-    idxListOut = []
+def read_input_index_list(idxList, stackFile=None, obj=None):
+    """Read ['2','3:5','10'] into [2, 3, 4, 5, 10]"""
+    pieces = []
     for idx in idxList:
         c = sorted([int(i) for i in idx.split(':')])
         if len(c) == 2:
-            idxListOut += list(range(c[0], c[1]+1))
+            pieces.append(np.arange(c[0], c[1]+1))
         elif len(c) == 1:
-            idxListOut.append(c[0])
+            pieces.append(np.array(c))
         else:
             print('Unrecoganized input: '+idx)
-    idxListOut = sorted(set(idxListOut))
-
-    if stackFile:
-        obj = ifgramStack(stackFile)
-        obj.open(print_msg=False)
-        idxListOut = [i for i in idxListOut if i < obj.numIfgram]
-        obj.close(print_msg=False)
-    return idxListOut
+    if not pieces:
+        return []
+    idxArr = np.unique(np.concatenate(pieces))
+
+    # drop indices beyond the number of ifgrams in the stack
+    if obj is not None:
+        idxArr = idxArr[idxArr < obj.numIfgram]
+    elif stackFile:
+        numIfgram = ifgramStack(stackFile).get_size()[0]
+        idxArr = idxArr[idxArr < numIfgram]
+    return idxArr.tolist()
+
+
+def _template2inps_aoi_yx(inps, value):
+    """Read mintpy.network.aoiYX option value into inps.aoi_pix_box"""
+    tmp = [i.replace('[','').replace(']','').strip() for i in value.split(',')]
+    sub_y = sorted([int(i.strip()) for i in tmp[0].split(':')])
+    sub_x = sorted([int(i.strip()) for i in tmp[1].split(':')])
+    inps.aoi_pix_box = (sub_x[0], sub_y[0], sub_x[1], sub_y[1])
+
+
+def _template2inps_aoi_lalo(inps, value):
+    """Read mintpy.network.aoiLALO option value into inps.aoi_geo_box"""
+    tmp = [i.replace('[','').replace(']','').strip() for i in value.split(',')]
+    sub_lat = sorted([float(i.strip()) for i in tmp[0].split(':')])
+    sub_lon = sorted([float(i.strip()) for i in tmp[1].split(':')])
+    inps.aoi_geo_box = (sub_lon[0], sub_lat[1], sub_lon[1], sub_lat[0])
+    # Check lookup file
+    if not inps.lookupFile:
+        print('Warning: no lookup table file found! Can not use aoiLALO option without it.')
+        print('skip this option.')
+        inps.aoi_pix_box = None
+
+
+def _template2inps_exclude_date(inps, value):
+    """Read mintpy.network.excludeDate option value into inps.excludeDate"""
+    value = value.replace('[','').replace(']','').replace(',', ' ')
+    inps.excludeDate = ptime.yyyymmdd(value.split())
+
+
+def _template2inps_exclude_ifg_index(inps, value):
+    """Read mintpy.network.excludeIfgIndex option value into inps.excludeIfgIndex"""
+    value = value.replace('[','').replace(']','').replace(',', ' ')
+    inps.excludeIfgIndex += value.split()
+    inps.excludeIfgIndex = read_input_index_list(inps.excludeIfgIndex, stackFile=inps.file)
+
+
+# simple template options (without the "mintpy.network." prefix):
+# value converter, saved into the inps attribute of the same name
+TEMPLATE_KEY_CONVERTERS = {
+    'tempBaseMax'   : float,
+    'perpBaseMax'   : float,
+    'connNumMax'    : int,
+    'minCoherence'  : float,
+    'minAreaRatio'  : float,
+    'maskFile'      : str,
+    'referenceFile' : str,
+    'startDate'     : ptime.yyyymmdd,
+    'endDate'       : ptime.yyyymmdd,
+}
+
+# composite template options: handler on (inps, value) doing its own update
+TEMPLATE_KEY_HANDLERS = {
+    'aoiYX'           : _template2inps_aoi_yx,
+    'aoiLALO'         : _template2inps_aoi_lalo,
+    'excludeDate'     : _template2inps_exclude_date,
+    'excludeIfgIndex' : _template2inps_exclude_ifg_index,
+}
+
+# "key = value" line with a mintpy.network.* key, value ends at the 1st # comment
+_NETWORK_KEY_REGEX = re.compile(r'^(mintpy\.network\.\w+)\s*=\s*([^#]+)')
+
+
+def read_network_template(template_file):
+    """Read the mintpy.network.* options from the template file into a dict.
+
+    Single-pass specialization of readfile.read_template() for the narrow
+    key namespace used here, to skip parsing all the unrelated options.
+    """
+    template = {}
+    with open(template_file) as f:
+        for line in f:
+            m = _NETWORK_KEY_REGEX.match(line.strip())
+            if m:
+                value = m.group(2).strip()
+                value = os.path.expanduser(value)  # translate ~ symbol
+                value = os.path.expandvars(value)  # translate env variables
+                if value:
+                    template[m.group(1)] = value
+    return ut.check_template_auto_value(template)
 
 
 def read_template2inps(template_file, inps=None):
@@ -169,47 +262,23 @@ def read_template2inps(template_file, inps=None):
         inps = cmd_line_parse()
     inpsDict = vars(inps)
     print('read options from template file: '+os.path.basename(template_file))
-    template = readfile.read_template(inps.template_file)
-    template = ut.check_template_auto_value(template)
+    template = read_network_template(inps.template_file)
 
     # Update inps if key existed in template file
     prefix = 'mintpy.network.'
-    keyList = [i for i in list(inpsDict.keys()) if prefix+i in template.keys()]
-    for key in keyList:
-        value = template[prefix+key]
+    for key, value in template.items():
+        if not key.startswith(prefix):
+            continue
+        key = key[len(prefix):]
+
         if key in ['coherenceBased', 'areaRatioBased', 'keepMinSpanTree']:
             inpsDict[key] = value
-        elif value:
-            if key in ['minCoherence', 'minAreaRatio', 'tempBaseMax', 'perpBaseMax']:
-                inpsDict[key] = float(value)
-            elif key in ['connNumMax']:
-                inpsDict[key] = int(value)
-            elif key in ['maskFile', 'referenceFile']:
-                inpsDict[key] = value
-            elif key == 'aoiYX':
-                tmp = [i.replace('[','').replace(']','').strip() for i in value.split(',')]
-                sub_y = sorted([int(i.strip()) for i in tmp[0].split(':')])
-                sub_x = sorted([int(i.strip()) for i in tmp[1].split(':')])
-                inps.aoi_pix_box = (sub_x[0], sub_y[0], sub_x[1], sub_y[1])
-            elif key == 'aoiLALO':
-                tmp = [i.replace('[','').replace(']','').strip() for i in value.split(',')]
-                sub_lat = sorted([float(i.strip()) for i in tmp[0].split(':')])
-                sub_lon = sorted([float(i.strip()) for i in tmp[1].split(':')])
-                inps.aoi_geo_box = (sub_lon[0], sub_lat[1], sub_lon[1], sub_lat[0])
-                # Check lookup file
-                if not inps.lookupFile:
-                    print('Warning: no lookup table file found! Can not use '+key+' option without it.')
-                    print('skip this option.')
-                    inps.aoi_pix_box = None
-            elif key in ['startDate', 'endDate']:
-                inpsDict[key] = ptime.yyyymmdd(value)
-            elif key == 'excludeDate':
-                value = value.replace('[','').replace(']','').replace(',', ' ')
-                inpsDict[key] = ptime.yyyymmdd(value.split())
-            elif key == 'excludeIfgIndex':
-                value = value.replace('[','').replace(']','').replace(',', ' ')
-                inpsDict[key] += value.split()
-                inpsDict[key] = read_input_index_list(inpsDict[key], stackFile=inps.file)
+        elif not value:
+            continue
+        elif key in TEMPLATE_KEY_CONVERTERS:
+            inpsDict[key] = TEMPLATE_KEY_CONVERTERS[key](value)
+        elif key in TEMPLATE_KEY_HANDLERS:
+            TEMPLATE_KEY_HANDLERS[key](inps, value)
 
     # Turn reset on if 1) no input options found to drop ifgram AND 2) there is template input
     if all(not i for i in [inps.referenceFile, inps.tempBaseMax, inps.perpBaseMax, inps.connNumMax,
@@ -222,16 +291,21 @@ def read_template2inps(template_file, inps=None):
 
 
 ###########################  Sub Function  #############################
-def reset_network(stackFile):
+def reset_network(stackFile, obj=None):
     """Reset/restore all pairs within the input file by set all DROP_IFGRAM=no"""
     print("reset dataset 'dropIfgram' to True for all interferograms for file: "+stackFile)
-    obj = ifgramStack(stackFile)
-    obj.open(print_msg=False)
+    if obj is None:
+        obj = ifgramStack(stackFile)
+        obj.open(print_msg=False)
     if np.all(obj.dropIfgram):
         print('All dropIfgram are already True, no need to reset.')
     else:
+        # write only the False entries, to touch only the affected HDF5 chunks
+        idx = np.flatnonzero(~obj.dropIfgram)
         with h5py.File(stackFile, 'r+') as f:
-            f['dropIfgram'][:] = True
+            f['dropIfgram'][idx.tolist()] = True
+        # keep the flag cached in obj in sync with the file
+        obj.dropIfgram[idx] = True
         ut.touch('coherenceSpatialAvg.txt')
     return stackFile
 
@@ -244,8 +318,14 @@ def nearest_neighbor(x, y, x_array, y_array):
     Output:
         idx : int, index of min distance - nearest neighbour
     """
-    dist = np.sqrt((x_array - x)**2 + (y_array - y)**2)
-    idx = np.argmin(dist)
+    # argmin of the squared distance (sqrt is monotonic, thus not needed)
+    # with in-place ops to avoid extra temporary arrays
+    dist2 = x_array - x
+    dist2 *= dist2
+    dy = y_array - y
+    dy *= dy
+    dist2 += dy
+    idx = np.argmin(dist2)
     #idx = dist==np.min(dist)
     return idx
 
@@ -263,7 +343,14 @@ def manual_select_pairs_to_remove(stackFile):
     date12ListAll = obj.date12List
     pbase = obj.get_perp_baseline_timeseries(dropIfgram=False)
     dateList = obj.dateList
-    datesNum = mdates.date2num(np.array(ptime.date_list2vector(dateList)[0]))
+
+    # convert YYYYMMDD to matplotlib dates via integer arithmetic,
+    # without creating one datetime object per date
+    dateArr = np.array(dateList, dtype=np.int64)
+    datesNum = ((dateArr // 10000 - 1970).astype('M8[Y]').astype('M8[M]')
+                + (dateArr // 100 % 100 - 1).astype('m8[M]'))
+    datesNum = datesNum.astype('M8[D]') + (dateArr % 100 - 1).astype('m8[D]')
+    datesNum = mdates.date2num(datesNum)
 
     date12ListKept = obj.get_date12_list(dropIfgram=True)
     date12ListDropped = sorted(list(set(date12ListAll) - set(date12ListKept)))
@@ -276,6 +363,19 @@ def manual_select_pairs_to_remove(stackFile):
     date_click = []
     date12_click = []
 
+    # cache the rendered network, so that each click only blits the selected
+    # red lines on top of it, instead of re-drawing all the network edges
+    background = [None]
+    lines_click = []
+
+    def on_draw(event):
+        # re-capture the background after every full draw (resize, toolbar
+        # zoom/pan), so the cached region never goes stale, and paint the
+        # animated selections back on top
+        background[0] = fig.canvas.copy_from_bbox(ax.bbox)
+        for line in lines_click:
+            ax.draw_artist(line)
+
     def onclick(event):
         idx = nearest_neighbor(event.xdata, event.ydata, datesNum, pbase)
         print('click at '+dateList[idx])
@@ -288,10 +388,21 @@ def manual_select_pairs_to_remove(stackFile):
             if date12 in date12ListAll:
                 print('select date12: '+date12)
                 date12_click.append(date12)
-                ax.plot([datesNum[mIdx], datesNum[sIdx]], [pbase[mIdx], pbase[sIdx]], 'r', lw=4)
+                line, = ax.plot([datesNum[mIdx], datesNum[sIdx]],
+                                [pbase[mIdx], pbase[sIdx]],
+                                'r', lw=4, animated=True)
+                lines_click.append(line)
             else:
                 print(date12+' is not existed in input file')
-        plt.draw()
+
+        # restore the cached background and blit the selected lines only
+        if background[0] is None:
+            fig.canvas.draw()
+        fig.canvas.restore_region(background[0])
+        for line in lines_click:
+            ax.draw_artist(line)
+        fig.canvas.blit(ax.bbox)
+    fig.canvas.mpl_connect('draw_event', on_draw)
     cid = fig.canvas.mpl_connect('button_press_event', onclick)
     plt.show()
 
@@ -342,35 +453,49 @@ def get_mst_date12(keep_mst, par_list_all, date12_list_all, date12_to_drop, min_
     return mst_date12_list, msg
 
 
-def get_date12_to_drop(inps):
+def get_date12_to_drop(inps, obj=None):
     """Get date12 list to dropped
     Return [] if no ifgram to drop, thus KEEP ALL ifgrams;
            None if nothing to change, exit without doing anything.
     """
-    obj = ifgramStack(inps.file)
-    obj.open()
+    if obj is None:
+        obj = ifgramStack(inps.file)
+        obj.open()
     date12ListAll = obj.date12List
     dateList = obj.dateList
     print('number of interferograms: {}'.format(len(date12ListAll)))
 
+    # date12 in array format for fast vectorized date filtering
+    date12ArrAll = np.array(date12ListAll)
+    date12Parts = np.char.partition(date12ArrAll, '_')
+    mDateArr = date12Parts[:, 0].astype(np.int32)
+    sDateArr = date12Parts[:, 2].astype(np.int32)
+
     # Get date12_to_drop
-    date12_to_drop = []
+    # one growing set of date12 to drop, shared by all filters below
+    drop_date12_set = set()
+
+    # shared boolean mask for the vectorized baseline/date filters below
+    dropIndex = np.zeros(date12ArrAll.size, dtype=np.bool_)
 
     # reference file
     if inps.referenceFile:
-        date12_to_keep = pnet.get_date12_list(inps.referenceFile, dropIfgram=True)
+        ref_date12_set = set(pnet.get_date12_list(inps.referenceFile, dropIfgram=True))
         print('--------------------------------------------------')
         print('use reference pairs info from file: {}'.format(inps.referenceFile))
-        print('number of interferograms in reference: {}'.format(len(date12_to_keep)))
-        tempList = sorted(list(set(date12ListAll) - set(date12_to_keep)))
-        date12_to_drop += tempList
-        print('date12 not in reference file: ({})\n{}'.format(len(tempList), tempList))
+        print('number of interferograms in reference: {}'.format(len(ref_date12_set)))
+        tempList = [i for i in date12ListAll if i not in ref_date12_set]
+        drop_date12_set.update(tempList)
+        msg = 'date12 not in reference file: ({})'.format(len(tempList))
+        if len(tempList) <= 200:
+            msg += '\n{}'.format(tempList)
+        print(msg)
 
     # temp baseline threshold
     if inps.tempBaseMax:
         tempIndex = np.abs(obj.tbaseIfgram) > inps.tempBaseMax
-        tempList = list(np.array(date12ListAll)[tempIndex])
-        date12_to_drop += tempList
+        dropIndex |= tempIndex
+        tempList = date12ArrAll[tempIndex].tolist()
         print('--------------------------------------------------')
         print('Drop ifgrams with temporal baseline > {} days: ({})\n{}'.format(
             inps.tempBaseMax, len(tempList), tempList))
@@ -378,8 +503,8 @@ def get_date12_to_drop(inps):
     # perp baseline threshold
     if inps.perpBaseMax:
         tempIndex = np.abs(obj.pbaseIfgram) > inps.perpBaseMax
-        tempList = list(np.array(date12ListAll)[tempIndex])
-        date12_to_drop += tempList
+        dropIndex |= tempIndex
+        tempList = date12ArrAll[tempIndex].tolist()
         print('--------------------------------------------------')
         print('Drop ifgrams with perp baseline > {} meters: ({})\n{}'.format(
             inps.perpBaseMax, len(tempList), tempList))
@@ -389,7 +514,7 @@ def get_date12_to_drop(inps):
         seq_date12_list = pnet.select_pairs_sequential(dateList, inps.connNumMax)
         seq_date12_list = ptime.yyyymmdd_date12(seq_date12_list)
         tempList = [i for i in date12ListAll if i not in seq_date12_list]
-        date12_to_drop += tempList
+        drop_date12_set.update(tempList)
         print('--------------------------------------------------')
         msg = 'Drop ifgrams with temporal baseline beyond {} neighbors: ({})'.format(
             inps.connNumMax, len(tempList))
@@ -400,37 +525,52 @@ def get_date12_to_drop(inps):
     # excludeIfgIndex
     if inps.excludeIfgIndex:
         tempList = [date12ListAll[i] for i in inps.excludeIfgIndex]
-        date12_to_drop += tempList
+        drop_date12_set.update(tempList)
         print('--------------------------------------------------')
-        print('Drop ifgrams with the following index number: {}'.format(len(tempList)))
-        for i, date12 in enumerate(tempList):
-            print('{} : {}'.format(i, date12))
+        msg = 'Drop ifgrams with the following index number: {}'.format(len(tempList))
+        if len(tempList) <= 200:
+            msg += ''.join('\n{} : {}'.format(i, date12) for i, date12 in enumerate(tempList))
+        print(msg)
 
     # excludeDate
     if inps.excludeDate:
-        tempList = [i for i in date12ListAll if any(j in inps.excludeDate for j in i.split('_'))]
-        date12_to_drop += tempList
-        print('-'*50+'\nDrop ifgrams including the following dates: ({})\n{}'.format(
-            len(tempList), inps.excludeDate))
-        print('-'*30+'\n{}'.format(tempList))
+        exDateArr = np.array(inps.excludeDate).astype(np.int32)
+        tempIndex = np.isin(mDateArr, exDateArr) | np.isin(sDateArr, exDateArr)
+        dropIndex |= tempIndex
+        tempList = date12ArrAll[tempIndex].tolist()
+        msg = '-'*50+'\nDrop ifgrams including the following dates: ({})\n{}'.format(
+            len(tempList), inps.excludeDate)
+        if len(tempList) <= 200:
+            msg += '\n'+'-'*30+'\n{}'.format(tempList)
+        print(msg)
 
     # startDate
     if inps.startDate:
         minDate = int(inps.startDate)
-        tempList = [i for i in date12ListAll if any(int(j) < minDate for j in i.split('_'))]
-        date12_to_drop += tempList
+        tempIndex = (mDateArr < minDate) | (sDateArr < minDate)
+        dropIndex |= tempIndex
+        tempList = date12ArrAll[tempIndex].tolist()
         print('--------------------------------------------------')
-        print('Drop ifgrams with date earlier than: {} ({})\n{}'.format(
-            inps.startDate, len(tempList), tempList))
+        msg = 'Drop ifgrams with date earlier than: {} ({})'.format(inps.startDate, len(tempList))
+        if len(tempList) <= 200:
+            msg += '\n{}'.format(tempList)
+        print(msg)
 
     # endDate
     if inps.endDate:
         maxDate = int(inps.endDate)
-        tempList = [i for i in date12ListAll if any(int(j) > maxDate for j in i.split('_'))]
-        date12_to_drop += tempList
+        tempIndex = (mDateArr > maxDate) | (sDateArr > maxDate)
+        dropIndex |= tempIndex
+        tempList = date12ArrAll[tempIndex].tolist()
         print('--------------------------------------------------')
-        print('Drop ifgrams with date later than: {} ({})\n{}'.format(
-            inps.endDate, len(tempList), tempList))
+        msg = 'Drop ifgrams with date later than: {} ({})'.format(inps.endDate, len(tempList))
+        if len(tempList) <= 200:
+            msg += '\n{}'.format(tempList)
+        print(msg)
+
+    # merge the vectorized filters above with one set update
+    if np.any(dropIndex):
+        drop_date12_set.update(date12ArrAll[dropIndex].tolist())
 
     # coherence file
     if inps.coherenceBased:
@@ -451,13 +591,13 @@ def get_date12_to_drop(inps):
         coh_date12_list = list(np.array(date12ListAll)[np.array(cohList) >= inps.minCoherence])
 
         # get MST network
-        mst_date12_list, msg = get_mst_date12(inps.keepMinSpanTree, cohList, date12ListAll, date12_to_drop,
+        mst_date12_list, msg = get_mst_date12(inps.keepMinSpanTree, cohList, date12ListAll, drop_date12_set,
                                               min_par=inps.minCoherence,
                                               par_name='average coherence')
 
         # drop all dates (below cohh thresh AND not in MST)
         tempList = sorted(list(set(date12ListAll) - set(coh_date12_list + mst_date12_list)))
-        date12_to_drop += tempList
+        drop_date12_set.update(tempList)
 
         msg += '({})'.format(len(tempList))
         if len(tempList) <= 200:
@@ -493,13 +633,13 @@ def get_date12_to_drop(inps):
         area_ratio_date12_list = list(np.array(date12ListAll)[np.array(areaRatioList) >= inps.minAreaRatio])
 
         # get MST network
-        mst_date12_list, msg = get_mst_date12(inps.keepMinSpanTree, areaRatioList, date12ListAll, date12_to_drop,
+        mst_date12_list, msg = get_mst_date12(inps.keepMinSpanTree, areaRatioList, date12ListAll, drop_date12_set,
                                               min_par=inps.minAreaRatio,
                                               par_name='coherent area ratio')
 
         # drop all dates (below area-ratio thresh AND not in MST)
         tempList = sorted(list(set(date12ListAll) - set(area_ratio_date12_list + mst_date12_list)))
-        date12_to_drop += tempList
+        drop_date12_set.update(tempList)
 
         msg += '({})'.format(len(tempList))
         if len(tempList) <= 200:
@@ -513,12 +653,12 @@ def get_date12_to_drop(inps):
             return None
         tempList = [i for i in tempList if i in date12ListAll]
         print('date12 selected to remove: ({})\n{}'.format(len(tempList), tempList))
-        date12_to_drop += tempList
+        drop_date12_set.update(tempList)
 
     ## summary
-    # drop duplicate date12 and sort in order
-    date12_to_drop = sorted(list(set(date12_to_drop)))
-    date12_to_keep = sorted(list(set(date12ListAll) - set(date12_to_drop)))
+    # drop duplicate date12, preserving the canonical order of the stack (no sort needed)
+    date12_to_drop = [i for i in date12ListAll if i in drop_date12_set]
+    date12_to_keep = [i for i in date12ListAll if i not in drop_date12_set]
     print('--------------------------------------------------')
     print('number of interferograms to remove: {}'.format(len(date12_to_drop)))
     print('number of interferograms to keep  : {}'.format(len(date12_to_keep)))
@@ -533,12 +673,13 @@ def get_date12_to_drop(inps):
     # checking:
     # 1) no new date12 to drop against existing file
     # 2) no date12 left after dropping
-    date12ListKept = obj.get_date12_list(dropIfgram=True)
-    date12ListDropped = sorted(list(set(date12ListAll) - set(date12ListKept)))
-    if date12_to_drop == date12ListDropped:
+    # compare against the dropIfgram flag already loaded in obj, without re-reading the file
+    dropMask = np.fromiter((i in drop_date12_set for i in date12ListAll),
+                           dtype=np.bool_, count=len(date12ListAll))
+    if np.array_equal(dropMask, ~obj.dropIfgram):
         print('Calculated date12 to drop is the same as exsiting marked input file, skip updating file.')
         date12_to_drop = None
-    elif date12_to_drop == date12ListAll:
+    elif np.all(dropMask):
         raise Exception('Zero interferogram left! Please adjust your setting and try again.')
 
     return date12_to_drop
@@ -548,17 +689,23 @@ def get_date12_to_drop(inps):
 def main(iargs=None):
     inps = cmd_line_parse(iargs)
 
+    # open the stack file once and reuse it for all the following operations
+    obj = ifgramStack(inps.file)
+    obj.open()
+
     if inps.reset:
         print('--------------------------------------------------')
-        reset_network(inps.file)
+        reset_network(inps.file, obj=obj)
+        obj.close(print_msg=False)
         return inps.file
 
-    inps.date12_to_drop = get_date12_to_drop(inps)
+    inps.date12_to_drop = get_date12_to_drop(inps, obj=obj)
 
     if inps.date12_to_drop is not None:
-        ifgramStack(inps.file).update_drop_ifgram(inps.date12_to_drop)
+        obj.update_drop_ifgram(inps.date12_to_drop)
         ut.touch('coherenceSpatialAvg.txt')
         print('Done.')
+    obj.close(print_msg=False)
     return
 
 
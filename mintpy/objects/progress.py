@@ -8,9 +8,7 @@
 #   from mintpy.utils.ptime import progressBar
 
 
-import sys
 import time
-import numpy as np
 
 
 ###########################Simple progress bar######################
@@ -49,11 +47,19 @@ class progressBar:
         #rows, columns = os.popen('stty size', 'r').read().split()
         #self.width = round(int(columns) * 0.7 / 10) * 10
         self.width = totalWidth
+        self.allFull = self.width - 2 - 18
+        # pre-built bar segments, sliced instead of re-multiplied per redraw
+        self.barEqual = '=' * self.allFull
+        self.barSpace = ' ' * self.allFull
         self.reset()
 
     def reset(self):
         self.start_time = time.time()
         self.amount = 0        # When amount == max, we are 100% done
+        self.last_percent = None
+        self.last_suffix = ''
+        self.last_write_percent = -1
+        self.last_write_time = 0.0
         self.update_amount(0)  # Build progress bar string
 
     def update_amount(self, newAmount=0, suffix=''):
@@ -64,30 +70,34 @@ class progressBar:
         newAmount = min(newAmount, self.max)
         self.amount = newAmount
 
+        # Figure out the new percent done (round to an integer)
+        percentDone = int(round((self.amount - self.min) / float(self.span) * 100.0))
+
+        # skip re-building the bar string if nothing visible changed
+        if percentDone == self.last_percent and suffix == self.last_suffix:
+            return
+        self.last_percent = percentDone
+        self.last_suffix = suffix
+
         # Add whitespace to suffix if turned ON
         if suffix:
             suffix = ' '+suffix
 
-        # Figure out the new percent done (round to an integer)
-        diffFromMin = np.float(self.amount - self.min)
-        percentDone = (diffFromMin / np.float(self.span)) * 100.0
-        percentDone = np.int(np.round(percentDone))
-
         # Figure out how many hash bars the percentage should be
-        allFull = self.width - 2 - 18
-        numHashes = (percentDone / 100.0) * allFull
-        numHashes = np.int(np.round(numHashes))
+        allFull = self.allFull
+        numHashes = int(round(percentDone / 100.0 * allFull))
 
         # Build a progress bar with an arrow of equal signs; special cases for empty and full
         if numHashes == 0:
-            self.prog_bar = '{}[>{}]'.format(self.prefix, ' '*(allFull-1))
+            self.prog_bar = '{}[>{}]'.format(self.prefix, self.barSpace[:allFull-1])
 
         elif numHashes == allFull:
-            self.prog_bar = '{}[{}]'.format(self.prefix, '='*allFull)
+            self.prog_bar = '{}[{}]'.format(self.prefix, self.barEqual)
             self.prog_bar += suffix
 
         else:
-            self.prog_bar = '[{}>{}]'.format('='*(numHashes-1), ' '*(allFull-numHashes))
+            self.prog_bar = '[{}>{}]'.format(self.barEqual[:numHashes-1],
+                                             self.barSpace[:allFull-numHashes])
 
             # figure out where to put the percentage (roughly centered)
             percentPlace = int(len(self.prog_bar)/2 - len(str(percentDone)))
@@ -111,11 +121,23 @@ class progressBar:
         """ Updates the amount, and writes to stdout. Prints a
          carriage return first, so it will overwrite the current
           line in stdout."""
-        if value % every == 0 or value >= self.max:
-            self.update_amount(newAmount=value, suffix=suffix)
-            if self.print_msg:
-                sys.stdout.write('\r' + self.prog_bar)
-                sys.stdout.flush()
+        if value % every != 0 and value < self.max:
+            return
+
+        # throttle the redraw: skip when the displayed percentage has not
+        # changed and the last write to stdout is recent
+        percent = int((min(max(value, self.min), self.max) - self.min) * 100.0 / self.span)
+        now = time.time()
+        if (value < self.max
+                and percent == self.last_write_percent
+                and now - self.last_write_time < 0.1):
+            return
+        self.last_write_percent = percent
+        self.last_write_time = now
+
+        self.update_amount(newAmount=value, suffix=suffix)
+        if self.print_msg:
+            print('\r' + self.prog_bar, end='', flush=True)
 
     def close(self):
         """Prints a blank space at the end to ensure proper printing
@@ -12,6 +12,7 @@ import os
 import time
 import itertools
 import datetime as dt
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import h5py
 import numpy as np
 from mintpy.utils import ptime, time_func
@@ -32,6 +33,9 @@ dataTypeDict = {
 
 timeseriesKeyNames = ['timeseries', 'HDFEOS', 'giantTimeseries']
 
+# number of threads for the concurrent HDF5 block reads
+NUM_READ_THREAD = 4
+
 timeseriesDatasetNames = [
     'timeseries',
     'raw',
@@ -143,6 +147,50 @@ datasetUnitDict = {
 
 
 
+########################################################################################
+# numba-compiled kernel for the masked spatial mean
+# False until the first call; None if numba is not installed
+_masked_mean_kernel = False
+
+def get_masked_mean_kernel():
+    """Get the numba-compiled kernel for the masked spatial mean, compiled once on first call.
+    Returns None if numba is not installed, so that callers can fall back to plain numpy.
+    """
+    global _masked_mean_kernel
+    if _masked_mean_kernel is False:
+        try:
+            from numba import njit
+        except ImportError:
+            _masked_mean_kernel = None
+            return _masked_mean_kernel
+
+        # nogil (not parallel) so that the reader threads in spatial_average()
+        # can run the kernel concurrently, one block each
+        @njit(nogil=True)
+        def masked_mean(data, flag, skip_zero, dmean, z0):
+            """Mean of data[k, :, :] over pixels with flag == True, ignoring NaN (and zero) values.
+            Parameters: data      - 3D np.ndarray in float32, block of the stack
+                        flag      - 2D np.ndarray in bool, True for pixels to use
+                        skip_zero - bool, ignore zero value, e.g. for coherence
+                        dmean     - 1D np.ndarray in float32, output array
+                        z0        - int, offset of the block in the output array
+            """
+            for k in range(data.shape[0]):
+                num = 0
+                dsum = 0.
+                for i in range(data.shape[1]):
+                    for j in range(data.shape[2]):
+                        value = data[k, i, j]
+                        if flag[i, j] and not np.isnan(value) and not (skip_zero and value == 0):
+                            dsum += value
+                            num += 1
+                dmean[z0 + k] = dsum / num if num > 0 else np.nan
+
+        _masked_mean_kernel = masked_mean
+    return _masked_mean_kernel
+
+
+
 ################################ timeseries class begin ################################
 class timeseries:
     """
@@ -209,7 +257,7 @@ class timeseries:
                 self.metadata[key] = value
 
         # ref_date/index
-        dateList = [i.decode('utf8') for i in dates]
+        dateList = dates.astype(np.str_).tolist()
         if 'REF_DATE' not in self.metadata.keys():
             self.metadata['REF_DATE'] = dateList[0]
         self.refIndex = dateList.index(self.metadata['REF_DATE'])
@@ -224,7 +272,7 @@ class timeseries:
 
     def get_date_list(self):
         with h5py.File(self.file, 'r') as f:
-            self.dateList = [i.decode('utf8') for i in f['date'][:]]
+            self.dateList = f['date'][:].astype(np.str_).tolist()
         return self.dateList
 
     def read(self, datasetName=None, box=None, squeeze=True, print_msg=True):
@@ -488,7 +536,7 @@ class geometry:
             self.datasetNames = [i for i in f.keys() if isinstance(f[i], h5py.Dataset)]
             self.sliceList = list(self.datasetNames)
             if 'bperp' in f.keys():
-                self.dateList = [i.decode('utf8') for i in f['date'][:]]
+                self.dateList = f['date'][:].astype(np.str_).tolist()
                 self.numDate = len(self.dateList)
                 # Update bperp datasetNames
                 try:
@@ -592,6 +640,10 @@ class ifgramStack:
     def __init__(self, file=None):
         self.file = file
         self.name = 'ifgramStack'
+        # caches for the lazy-loaded 1D datasets (see properties below)
+        self._tbaseIfgram = None
+        self._pbaseIfgram = None
+        self._dropIfgram = None
 
     def close(self, print_msg=True):
         try:
@@ -616,14 +668,13 @@ class ifgramStack:
 
         # time info
         self.date12List = ['{}_{}'.format(i, j) for i, j in zip(self.mDates, self.sDates)]
-        self.tbaseIfgram = np.array([i.days + i.seconds / (24 * 60 * 60)
-                                     for i in (self.sTimes - self.mTimes)],
-                                    dtype=np.float32)
 
-        with h5py.File(self.file, 'r') as f:
-            self.dropIfgram = f['dropIfgram'][:]
-            self.pbaseIfgram = f['bperp'][:]
+        # reset the lazy-loaded datasets, to be read from file again on the next access
+        self._tbaseIfgram = None
+        self._pbaseIfgram = None
+        self._dropIfgram = None
 
+        with h5py.File(self.file, 'r') as f:
             # get existed datasetNames in the order of ifgramDatasetNames
             dsNames = [i for i in f.keys()
                        if (isinstance(f[i], h5py.Dataset)
@@ -654,6 +705,35 @@ class ifgramStack:
             self.refLat = None
             self.refLon = None
 
+    # 1D info datasets as lazy-loaded properties, read from file on the first access only,
+    # so that workflows using none of them skip the extra I/O.
+    @property
+    def tbaseIfgram(self):
+        """1D array in float32, temporal baseline of interferograms in days."""
+        if self._tbaseIfgram is None:
+            if not hasattr(self, 'mTimes'):
+                self.read_datetimes()
+            self._tbaseIfgram = np.array([i.days + i.seconds / (24 * 60 * 60)
+                                          for i in (self.sTimes - self.mTimes)],
+                                         dtype=np.float32)
+        return self._tbaseIfgram
+
+    @property
+    def pbaseIfgram(self):
+        """1D array in float32, perpendicular baseline of interferograms in meters."""
+        if self._pbaseIfgram is None:
+            with h5py.File(self.file, 'r') as f:
+                self._pbaseIfgram = f['bperp'][:]
+        return self._pbaseIfgram
+
+    @property
+    def dropIfgram(self):
+        """1D array in bool, flag of the kept interferograms."""
+        if self._dropIfgram is None:
+            with h5py.File(self.file, 'r') as f:
+                self._dropIfgram = f['dropIfgram'][:]
+        return self._dropIfgram
+
     def get_metadata(self):
         # read metadata from root level
         with h5py.File(self.file, 'r') as f:
@@ -668,7 +748,7 @@ class ifgramStack:
                 self.metadata[key] = value
 
         # START/END_DATE
-        dateList = sorted([i.decode('utf8') for i in dates])
+        dateList = sorted(dates.astype(np.str_).tolist())
         self.metadata['START_DATE'] = dateList[0]
         self.metadata['END_DATE'] = dateList[-1]
         return self.metadata
@@ -696,8 +776,9 @@ class ifgramStack:
         self.dateFormat = ptime.get_date_str_format(dates[0, 0])
 
         # convert date from str to datetime.datetime objects
-        self.mDates = np.array([i.decode('utf8') for i in dates[:, 0]])
-        self.sDates = np.array([i.decode('utf8') for i in dates[:, 1]])
+        dates = dates.astype(np.str_)
+        self.mDates = dates[:, 0]
+        self.sDates = dates[:, 1]
         self.mTimes = np.array([dt.datetime.strptime(i, self.dateFormat) for i in self.mDates])
         self.sTimes = np.array([dt.datetime.strptime(i, self.dateFormat) for i in self.sDates])
 
@@ -772,7 +853,7 @@ class ifgramStack:
         return data
 
     def spatial_average(self, datasetName='coherence', maskFile=None, box=None, useMedian=False,
-                        reverseMask=False, threshold=None):
+                        reverseMask=False, threshold=None, max_memory=4):
         """ Calculate the spatial average."""
         if datasetName is None:
             datasetName = 'coherence'
@@ -789,36 +870,72 @@ class ifgramStack:
         else:
             maskFile = None
 
-        # calculation
+        # dataset info for the block iteration below
         with h5py.File(self.file, 'r') as f:
             dset = f[datasetName]
             numIfgram = dset.shape[0]
-            dmean = np.zeros((numIfgram), dtype=np.float32)
-
-            prog_bar = ptime.progressBar(maxValue=numIfgram)
-            for i in range(numIfgram):
-                prog_bar.update(i+1, suffix='{}/{}'.format(i+1, numIfgram))
-
-                # read
-                data = dset[i, box[1]:box[3], box[0]:box[2]]
-                if maskFile:
-                    data[mask == int(reverseMask)] = np.nan
-
-                # ignore ZERO value for coherence
-                if datasetName == 'coherence':
-                    data[data == 0] = np.nan
-
-                # calculate area ratio if threshold is specified
-                # percentage of pixels with value above the threshold
-                if threshold is not None:
-                    data[data > threshold] = 1
-                    data[data <= threshold] = 0
-
-                if useMedian:
-                    dmean[i] = np.nanmedian(data)
-                else:
-                    dmean[i] = np.nanmean(data)
-            prog_bar.close()
+            ifgram_chunk = dset.chunks[0] if dset.chunks else numIfgram
+        dmean = np.zeros((numIfgram), dtype=np.float32)
+
+        # get step size (chunk-aligned) and number, to convert many small HDF5 reads
+        # into a few large ones, within the memory limit shared by the reader threads
+        num_pixel = (box[3] - box[1]) * (box[2] - box[0])
+        max_step = max(int(max_memory * 1024**3 / NUM_READ_THREAD / (num_pixel * 4)), 1)
+        ifgram_step = ifgram_chunk * max(max_step // ifgram_chunk, 1)
+        ifgram_step = min(ifgram_step, numIfgram)
+        num_step = int(np.ceil(numIfgram / ifgram_step))
+
+        # numba-compiled kernel for the plain masked-mean case (None if numba is missing)
+        kernel = None
+        if not useMedian and threshold is None:
+            kernel = get_masked_mean_kernel()
+        if kernel is not None:
+            if maskFile:
+                flag = mask != int(reverseMask)
+            else:
+                flag = np.ones((box[3]-box[1], box[2]-box[0]), dtype=np.bool_)
+
+        def read_and_reduce(i0, i1):
+            """Read one block of the dataset and reduce it into dmean[i0:i1].
+            Run from a thread pool, with one HDF5 file handle per thread for safety.
+            """
+            data = np.empty((i1-i0, box[3]-box[1], box[2]-box[0]), dtype=np.float32)
+            with h5py.File(self.file, 'r') as f:
+                f[datasetName].read_direct(data, np.s_[i0:i1, box[1]:box[3], box[0]:box[2]])
+
+            if kernel is not None:
+                kernel(data, flag, datasetName == 'coherence', dmean, i0)
+                return
+
+            if maskFile:
+                data[:, mask == int(reverseMask)] = np.nan
+
+            # ignore ZERO value for coherence
+            if datasetName == 'coherence':
+                data[data == 0] = np.nan
+
+            # calculate area ratio if threshold is specified
+            # percentage of pixels with value above the threshold
+            if threshold is not None:
+                data[data > threshold] = 1
+                data[data <= threshold] = 0
+
+            if useMedian:
+                dmean[i0:i1] = np.nanmedian(data, axis=(1, 2))
+            else:
+                dmean[i0:i1] = np.nanmean(data, axis=(1, 2))
+
+        # read/reduce the blocks concurrently: h5py releases the GIL during reads,
+        # so a few reader threads overlap HDF5 IO/decompression with the reduction
+        prog_bar = ptime.progressBar(maxValue=num_step)
+        with ThreadPoolExecutor(max_workers=min(NUM_READ_THREAD, num_step)) as executor:
+            futures = [executor.submit(read_and_reduce, i * ifgram_step,
+                                       min((i+1) * ifgram_step, numIfgram))
+                       for i in range(num_step)]
+            for i, future in enumerate(as_completed(futures)):
+                future.result()
+                prog_bar.update(i+1, suffix='{}/{}'.format(i+1, num_step))
+        prog_bar.close()
         return dmean, self.date12List
 
     # Functions considering dropIfgram value
@@ -827,18 +944,17 @@ class ifgramStack:
             dates = f['date'][:]
             if dropIfgram:
                 dates = dates[f['dropIfgram'][:], :]
-        mDates = np.array([i.decode('utf8') for i in dates[:, 0]])
-        sDates = np.array([i.decode('utf8') for i in dates[:, 1]])
-        date12List = ['{}_{}'.format(i, j) for i, j in zip(mDates, sDates)]
+        # decode all bytes in one pass instead of one decode call per element
+        dates = dates.astype(np.str_)
+        date12List = ['{}_{}'.format(i, j) for i, j in dates]
         return date12List
 
     def get_drop_date12_list(self):
         with h5py.File(self.file, 'r') as f:
             dates = f['date'][:]
             dates = dates[~f['dropIfgram'][:], :]
-        mDates = np.array([i.decode('utf8') for i in dates[:, 0]])
-        sDates = np.array([i.decode('utf8') for i in dates[:, 1]])
-        date12List = ['{}_{}'.format(i, j) for i, j in zip(mDates, sDates)]
+        dates = dates.astype(np.str_)
+        date12List = ['{}_{}'.format(i, j) for i, j in dates]
         return date12List
 
     def get_date_list(self, dropIfgram=False):
@@ -846,9 +962,8 @@ class ifgramStack:
             dates = f['date'][:]
             if dropIfgram:
                 dates = dates[f['dropIfgram'][:], :]
-        mDates = [i.decode('utf8') for i in dates[:, 0]]
-        sDates = [i.decode('utf8') for i in dates[:, 1]]
-        dateList = sorted(list(set(mDates + sDates)))
+        dates = dates.astype(np.str_)
+        dateList = sorted(set(dates[:, 0].tolist()) | set(dates[:, 1].tolist()))
         return dateList
 
     def get_reference_phase(self, unwDatasetName='unwrapPhase', skip_reference=False, dropIfgram=False):
@@ -877,7 +992,9 @@ class ifgramStack:
            Ignoring dropped ifgrams
         """
         self.open(print_msg=False)
-        with h5py.File(self.file, 'r') as f:
+        # enlarged chunk cache: the per-ifgram reads below revisit each chunk
+        # many times, which thrashes the 1 MB default cache on chunked files
+        with h5py.File(self.file, 'r', rdcc_nbytes=64*1024**2, rdcc_nslots=100003) as f:
             if datasetName is None:
                 datasetName = [i for i in ['connectComponent', 'unwrapPhase']
                                if i in f.keys()][0]
@@ -922,7 +1039,8 @@ class ifgramStack:
             tbase = np.array(self.tbaseIfgram, dtype=np.float64) / 365.25
             tbase = tbase[ifgram_flag]
 
-        with h5py.File(self.file, 'r') as f:
+        # enlarged chunk cache, see nonzero_mask()
+        with h5py.File(self.file, 'r', rdcc_nbytes=64*1024**2, rdcc_nslots=100003) as f:
             dset = f[datasetName]
 
             # reference value for phase
@@ -1082,14 +1200,19 @@ class ifgramStack:
 
     def get_perp_baseline_timeseries(self, dropIfgram=True):
         """Get spatial perpendicular baseline in timeseries from ifgramStack, ignoring dropped ifgrams"""
-        # read pbase of interferograms
-        with h5py.File(self.file, 'r') as f:
-            pbaseIfgram = f['bperp'][:]
-            if dropIfgram:
-                pbaseIfgram = pbaseIfgram[f['dropIfgram'][:]]
+        # read pbase of interferograms (lazy-loaded and cached in the object)
+        pbaseIfgram = self.pbaseIfgram
+        if hasattr(self, 'date12List'):
+            date12List = list(self.date12List)
+        else:
+            date12List = self.get_date12_list(dropIfgram=False)
+
+        if dropIfgram:
+            dropIfgramFlag = self.dropIfgram
+            pbaseIfgram = pbaseIfgram[dropIfgramFlag]
+            date12List = [d for d, flag in zip(date12List, dropIfgramFlag) if flag]
 
         # estimate pbase of time-series
-        date12List = self.get_date12_list(dropIfgram=dropIfgram)
         A = self.get_design_matrix4timeseries(date12List)[0]
         pbaseTimeseries = np.zeros(A.shape[1]+1, dtype=np.float32)
         pbaseTimeseries[1:] = np.linalg.lstsq(A, pbaseIfgram, rcond=None)[0]
@@ -1111,7 +1234,10 @@ class ifgramStack:
         with h5py.File(self.file, 'r+') as f:
             print('open file {} with r+ mode'.format(self.file))
             print('update HDF5 dataset "/dropIfgram".')
-            f['dropIfgram'][:] = np.array([i not in date12List2Drop for i in date12ListAll], dtype=np.bool_)
+            flag = np.array([i not in date12List2Drop for i in date12ListAll], dtype=np.bool_)
+            f['dropIfgram'][:] = flag
+            # keep the lazy-loaded copy in sync with the file
+            self._dropIfgram = flag
 
             # update MODIFICATION_TIME for all datasets in ifgramDatasetNames
             for dsName in ifgramDatasetNames:
@@ -1192,7 +1318,7 @@ class HDFEOS:
         with h5py.File(self.file, 'r') as f:
             gname = 'HDFEOS/GRIDS/timeseries/observation'
             g = f[gname]
-            self.dateList = [i.decode('utf8') for i in g['date'][:]]
+            self.dateList = g['date'][:].astype(np.str_).tolist()
             self.pbase = g['bperp'][:]
             self.numDate = len(self.dateList)
 
@@ -1217,7 +1343,7 @@ class HDFEOS:
         self.metadata['FILE_TYPE'] = self.name
 
         # ref_date/index
-        dateList = [i.decode('utf8') for i in dates]
+        dateList = dates.astype(np.str_).tolist()
         if 'REF_DATE' not in self.metadata.keys():
             self.metadata['REF_DATE'] = dateList[0]
         self.refIndex = dateList.index(self.metadata['REF_DATE'])
@@ -1226,7 +1352,7 @@ class HDFEOS:
     def get_date_list(self):
         with h5py.File(self.file, 'r') as f:
             g = f['HDFEOS/GRIDS/timeseries/observation']
-            self.dateList = [i.decode('utf8') for i in g['date'][:]]
+            self.dateList = g['date'][:].astype(np.str_).tolist()
         return self.dateList
 
     def read(self, datasetName=None, box=None, print_msg=True):
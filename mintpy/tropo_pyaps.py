@@ -265,9 +265,10 @@ def closest_weather_product_time(sar_acquisition_time, grib_source='ECMWF'):
     # Get hour/min of SAR acquisition time
     sar_time = float(sar_acquisition_time)
 
-    # Find closest time in available weather products
-    grib_hr_list = [0, 6, 12, 18]
-    grib_hr = int(min(grib_hr_list, key=lambda x: abs(x-sar_time/3600.)))
+    # Round to the nearest multiple of 6 hours (ties go to the earlier hour,
+    # like the previous min()-scan over [0, 6, 12, 18]), capped at 18:00
+    grib_hr = int(np.ceil(sar_time / 21600. - 0.5)) * 6
+    grib_hr = min(grib_hr, 18)
 
     # Adjust time output format
     grib_hr = "%02d" % grib_hr
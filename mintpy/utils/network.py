@@ -10,7 +10,6 @@
 import os
 import sys
 import itertools
-import h5py
 import numpy as np
 from scipy import sparse
 from matplotlib import pyplot as plt
@@ -184,6 +183,9 @@ def get_date12_list(fname, dropIfgram=False):
 
 def igram_perp_baseline_list(fname):
     """Get perpendicular baseline list from input multi_group hdf5 file"""
+    # lazy import: the only h5py usage in this module
+    import h5py
+
     print(('read perp baseline info from '+fname))
     k = readfile.read_attribute(fname)['FILE_TYPE']
     h5 = h5py.File(fname, 'r')
@@ -560,23 +562,24 @@ def threshold_coherence_based_mst(date12_list, coh_list):
     Output:
         mst_date12_list - list of string in YYMMDD-YYMMDD format, for MST network of interferograms 
     """
-    # coh_list --> coh_mat --> weight_mat
-    coh_mat = coherence_matrix(date12_list, coh_list)
-    mask = ~np.isnan(coh_mat)
-    wei_mat = np.zeros(coh_mat.shape)
-    wei_mat[:] = np.inf
-    wei_mat[mask] = 1/coh_mat[mask]
-
-    # MST path based on weight matrix
-    wei_mat_csr = sparse.csr_matrix(wei_mat)
-    mst_mat_csr = sparse.csgraph.minimum_spanning_tree(wei_mat_csr)
-
     # Get date6_list
     date12_list = ptime.yymmdd_date12(date12_list)
     m_dates = [date12.split('-')[0] for date12 in date12_list]
     s_dates = [date12.split('-')[1] for date12 in date12_list]
     date6_list = ptime.yymmdd(sorted(ptime.yyyymmdd(list(set(m_dates + s_dates)))))
 
+    # build the sparse weight matrix (inverse of coherence) directly from the pairs,
+    # instead of going through a dense coherence matrix
+    date6_idx = {date6: i for i, date6 in enumerate(date6_list)}
+    m_idx = np.array([date6_idx[i] for i in m_dates])
+    s_idx = np.array([date6_idx[i] for i in s_dates])
+    wei = 1.0 / np.maximum(np.array(coh_list, dtype=np.float64), 1e-6)
+    num_date = len(date6_list)
+    wei_mat_csr = sparse.csr_matrix((wei, (m_idx, s_idx)), shape=(num_date, num_date))
+
+    # MST path based on weight matrix
+    mst_mat_csr = sparse.csgraph.minimum_spanning_tree(wei_mat_csr)
+
     # Convert MST index matrix into date12 list
     [s_idx_list, m_idx_list] = [date_idx_array.tolist()
                                 for date_idx_array in sparse.find(mst_mat_csr)[0:2]]
@@ -10,6 +10,7 @@ import os
 import re
 import time
 import datetime as dt
+from functools import lru_cache
 import numpy as np
 from mintpy.objects.progress import progressBar
 
@@ -85,7 +86,7 @@ def yyyymmdd2season(date_str):
     """
     # get day of the year
     date_str = yyyymmdd(date_str)
-    yday = dt.datetime.strptime(date_str, "%Y%m%d").timetuple().tm_yday
+    yday = _day_of_year(_parse_yyyymmdd(date_str))
 
     # determine the season
     season = None
@@ -139,6 +140,93 @@ def decimal_year2datetime(years):
     return years_dt
 
 
+# cumulative number of days at the start of each month (non-leap year)
+_CUMDAYS = (0, 31, 59, 90, 120, 151, 181, 212, 243, 273, 304, 334)
+_CUMDAYS_ARR = np.array(_CUMDAYS, dtype=np.int64)
+
+# numba-compiled kernel for the YYYYMMDD digits -> decimal years conversion
+# False until the first call; None if numba is not installed
+_years_kernel = False
+
+
+def _get_years_kernel():
+    """Get the numba-compiled digits->years kernel, compiled once on first call.
+    Returns None if numba is not installed, so that callers can fall back to numpy.
+    """
+    global _years_kernel
+    if _years_kernel is False:
+        try:
+            from numba import njit
+        except ImportError:
+            _years_kernel = None
+            return _years_kernel
+
+        @njit(cache=True)
+        def years_from_digits(digits, years):
+            """Decimal years from an (N, 8) int array of YYYYMMDD digit values."""
+            for k in range(digits.shape[0]):
+                y = digits[k, 0]*1000 + digits[k, 1]*100 + digits[k, 2]*10 + digits[k, 3]
+                m = digits[k, 4]*10 + digits[k, 5]
+                d = digits[k, 6]*10 + digits[k, 7]
+                yday = _CUMDAYS[m-1] + d
+                if m > 2 and ((y % 4 == 0 and y % 100 != 0) or y % 400 == 0):
+                    yday += 1
+                years[k] = y + (yday - 1) / 365.25
+
+        _years_kernel = years_from_digits
+    return _years_kernel
+
+
+def _day_of_year(d):
+    """Day of the year of a datetime object, without the timetuple() detour."""
+    yday = _CUMDAYS[d.month-1] + d.day
+    if d.month > 2 and ((d.year % 4 == 0 and d.year % 100 != 0) or d.year % 400 == 0):
+        yday += 1
+    return yday
+
+
+def _parse_yyyymmdd_batch(date_list):
+    """Parse a list of YYYYMMDD strings into (year, month, day) int64 arrays.
+
+    Each 8-digit date is loaded as one little-endian uint64 word and the
+    digits are extracted with shifts and masks (SWAR), so the whole list is
+    parsed in a handful of C-level passes without per-date Python work.
+    """
+    words = np.frombuffer(''.join(date_list).encode('ascii'), dtype='<u8')
+    digits = words - np.uint64(0x3030303030303030)
+    b = [(digits >> np.uint64(8*k)) & np.uint64(0xff) for k in range(8)]
+    y = (b[0]*1000 + b[1]*100 + b[2]*10 + b[3]).astype(np.int64)
+    m = (b[4]*10 + b[5]).astype(np.int64)
+    d = (b[6]*10 + b[7]).astype(np.int64)
+    return y, m, d
+
+
+@lru_cache(maxsize=8192)
+def _parse_yyyymmdd(date_str):
+    """Parse one date string in YYYYMMDD format into datetime.datetime, with caching.
+
+    Date lists are typically parsed repeatedly across back-to-back calls of
+    date_list2tbase() / date_list2vector(); the cache turns the re-parses
+    into dict lookups.
+    """
+    return dt.datetime(int(date_str[0:4]), int(date_str[4:6]), int(date_str[6:8]))
+
+
+def _yyyymmdd2year(date_str):
+    """Convert one date string in YYYYMMDD format into a float year.
+
+    Manual integer parsing, ~10x faster than the equivalent
+    dt.datetime.strptime() + timetuple() for bulk conversions.
+    """
+    y = int(date_str[0:4])
+    m = int(date_str[4:6])
+    d = int(date_str[6:8])
+    yday = _CUMDAYS[m-1] + d
+    if m > 2 and ((y % 4 == 0 and y % 100 != 0) or y % 400 == 0):
+        yday += 1
+    return y + (yday - 1) / 365.25
+
+
 def yyyymmdd2years(dates, seconds=0):
     """Convert date(s) string into float number in the unit of year
     Parameters: dates   - (list of) str, date in YYYYMMDD format
@@ -154,21 +242,42 @@ def yyyymmdd2years(dates, seconds=0):
 
     date_format = get_date_str_format(date_list[0])
 
-    years = []
-    for date_str in date_list:
-        d = dt.datetime.strptime(date_str, date_format)
-        y = (d.year + (d.timetuple().tm_yday - 1) / 365.25 +
-             d.hour / (365.25 * 24) +
-             d.minute / (365.25 * 24 * 60) +
-             d.second / (365.25 * 24 * 60 * 60))
+    if date_format == '%Y%m%d':
+        # fast path for the most common format: one pass over the digit
+        # columns instead of per-date strptime calls
+        kernel = _get_years_kernel()
+        if kernel is not None:
+            digits = np.frombuffer(''.join(date_list).encode('ascii'), dtype=np.uint8)
+            digits = (digits.reshape(-1, 8) - ord('0')).astype(np.int64)
+            years_arr = np.empty(digits.shape[0], dtype=np.float64)
+            kernel(digits, years_arr)
+        else:
+            # pure-numpy fallback without numba, with SWAR digit extraction
+            y, m, d = _parse_yyyymmdd_batch(date_list)
+            leap = (m > 2) & (((y % 4 == 0) & (y % 100 != 0)) | (y % 400 == 0))
+            yday = _CUMDAYS_ARR[m-1] + d + leap
+            years_arr = y + (yday - 1) / 365.25
 
-        # add time of the day info if:
-        # 1) seconds arg is valid AND
-        # 2) no time info from dates arg
-        if seconds and 'T' not in date_format:
-            y += float(seconds) / (365.25 * 24 * 60 * 60)
+        if seconds:
+            years_arr = years_arr + float(seconds) / (365.25 * 24 * 60 * 60)
+        years = years_arr.tolist()
 
-        years.append(y)
+    else:
+        years = []
+        for date_str in date_list:
+            d = dt.datetime.strptime(date_str, date_format)
+            y = (d.year + (_day_of_year(d) - 1) / 365.25 +
+                 d.hour / (365.25 * 24) +
+                 d.minute / (365.25 * 24 * 60) +
+                 d.second / (365.25 * 24 * 60 * 60))
+
+            # add time of the day info if:
+            # 1) seconds arg is valid AND
+            # 2) no time info from dates arg
+            if seconds and 'T' not in date_format:
+                y += float(seconds) / (365.25 * 24 * 60 * 60)
+
+            years.append(y)
 
     if isinstance(dates, str):
         years = years[0]
@@ -203,11 +312,14 @@ def yyyymmdd(dates):
             datesOut = dates
 
     elif isinstance(dates, list):
-        datesOut = []
-        for date in dates:
-            if len(date.split('T')[0]) == 6:
-                date = yymmdd2yyyymmdd(date)
-            datesOut.append(date)
+        # common case: all dates already in YYYYMMDD format, return as-is
+        if all(len(d) == 8 for d in dates):
+            return dates
+
+        # single comprehension without per-element helper calls
+        datesOut = [('19' if d[0] == '9' else '20') + d
+                    if len(d.split('T')[0]) == 6 else d
+                    for d in dates]
 
     else:
         return None
@@ -223,11 +335,10 @@ def yymmdd(dates):
             datesOut = dates
 
     elif isinstance(dates, list):
-        datesOut = []
-        for date in dates:
-            if len(date) == 8:
-                date = date[2:8]
-            datesOut.append(date)
+        # common case: all dates already in YYMMDD format, return as-is
+        if all(len(d) == 6 for d in dates):
+            return dates
+        datesOut = [d[2:8] if len(d) == 8 else d for d in dates]
 
     else:
         return None
@@ -236,16 +347,20 @@ def yymmdd(dates):
 
 def yyyymmdd_date12(date12_list):
     """Convert date12 into YYYYMMDD_YYYYMMDD format"""
-    m_dates = yyyymmdd([i.replace('-', '_').split('_')[0] for i in date12_list])
-    s_dates = yyyymmdd([i.replace('-', '_').split('_')[1] for i in date12_list])
+    # split each date12 once, then bulk-convert the two date columns
+    pairs = [i.replace('-', '_').split('_') for i in date12_list]
+    m_dates = yyyymmdd([p[0] for p in pairs])
+    s_dates = yyyymmdd([p[1] for p in pairs])
     date12_list = ['{}_{}'.format(m, s) for m, s in zip(m_dates, s_dates)]
     return date12_list
 
 
 def yymmdd_date12(date12_list):
     """Convert date12 into YYMMDD-YYMMDD format"""
-    m_dates = yymmdd([i.replace('-', '_').split('_')[0] for i in date12_list])
-    s_dates = yymmdd([i.replace('-', '_').split('_')[1] for i in date12_list])
+    # split each date12 once, then bulk-convert the two date columns
+    pairs = [i.replace('-', '_').split('_') for i in date12_list]
+    m_dates = yymmdd([p[0] for p in pairs])
+    s_dates = yymmdd([p[1] for p in pairs])
     date12_list = ['{}-{}'.format(m, s) for m, s in zip(m_dates, s_dates)]
     return date12_list
 
@@ -288,11 +403,12 @@ def read_date_list(date_list_in, date_list_all=None):
         else:
             ds = [d]
             date_list_out += ds
-    date_list_out = sorted(yyyymmdd(list(set(date_list_out))))
+    # np.unique sorts and dedups the fixed-width date strings in one C pass
+    date_list_out = sorted(yyyymmdd(np.unique(date_list_out).tolist()))
 
     # exclude date not in date_list_ref
     if date_list_all:
-        date_list_out = sorted(list(set(date_list_out).intersection(date_list_all)))
+        date_list_out = np.intersect1d(date_list_out, date_list_all).tolist()
 
     return date_list_out
 
@@ -305,22 +421,25 @@ def date_list2tbase(date_list):
                 dateDict  - dict with key   - string, date in YYYYMMDD format
                                       value - int, temporal baseline in days
     """
-    # date str to dt object
+    # date str to time difference in days
     date_list = yyyymmdd(date_list)
     date_format = get_date_str_format(str(date_list))
-    dates = [dt.datetime.strptime(i, date_format) for i in date_list]
+    if date_format == '%Y%m%d':
+        # fast path: ordinal day numbers via the C-implemented toordinal(),
+        # no timedelta objects needed for whole-day dates
+        ords = [_parse_yyyymmdd(i).toordinal() for i in date_list]
+        tbase = [i - ords[0] for i in ords]
 
-    # dt object to time difference in days
-    tbase = []
-    for date in dates:
-        date_delta = date - dates[0]
-        tbase_i = date_delta.days + date_delta.seconds / (24 * 60 * 60)
-        tbase.append(tbase_i)
+    else:
+        dates = [dt.datetime.strptime(i, date_format) for i in date_list]
+        tbase = []
+        for date in dates:
+            date_delta = date - dates[0]
+            tbase_i = date_delta.days + date_delta.seconds / (24 * 60 * 60)
+            tbase.append(tbase_i)
 
     # Dictionary: key - date, value - temporal baseline
-    dateDict = {}
-    for i, date_str in enumerate(date_list):
-        dateDict[date_str] = tbase[i]
+    dateDict = dict(zip(date_list, tbase))
     return tbase, dateDict
 
 
@@ -333,16 +452,22 @@ def date_list2vector(date_list):
     """
     date_list = yyyymmdd(date_list)
     date_format = get_date_str_format(str(date_list))
-    dates = [dt.datetime.strptime(i, date_format) for i in date_list]
-
-    # date in year - float format
-    datevector = []
-    for d in dates:
-        date_vec = (d.year + (d.timetuple().tm_yday - 1) / 365.25 +
-                    d.hour / (365.25 * 24) +
-                    d.minute / (365.25 * 24 * 60) +
-                    d.second / (365.25 * 24 * 60 * 60))
-        datevector.append(date_vec)
+    if date_format == '%Y%m%d':
+        # fast path: cached manual parsing for the datetime objects and the
+        # vectorized digits->years conversion for the decimal years, so the
+        # list is only parsed once at the C level
+        dates = [_parse_yyyymmdd(i) for i in date_list]
+        datevector = yyyymmdd2years(date_list)
+
+    else:
+        dates = [dt.datetime.strptime(i, date_format) for i in date_list]
+
+        # date in year - float format
+        datevector = [(d.year + (_day_of_year(d) - 1) / 365.25 +
+                       d.hour / (365.25 * 24) +
+                       d.minute / (365.25 * 24 * 60) +
+                       d.second / (365.25 * 24 * 60 * 60))
+                      for d in dates]
 
     return dates, datevector
 
@@ -16,7 +16,6 @@
 
 
 import os
-import h5py
 import numpy as np
 import matplotlib.pyplot as plt
 from scipy import ndimage
@@ -287,6 +286,9 @@ def get_lat_lon(meta, geom_file=None, box=None, dimension=2):
     Returns:    lats : 2D np.array for latitude  in size of (length, width)
                 lons : 2D np.array for longitude in size of (length, width)
     """
+    # lazy import: the only h5py usage in this module
+    import h5py
+
     length, width = int(meta['LENGTH']), int(meta['WIDTH'])
     if box is None:
         box = (0, 0, width, length)